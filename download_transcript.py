@@ -5,23 +5,43 @@
 # ]
 # ///
 """CLI tool to download YouTube video transcripts using youtube-transcript-api."""
-from __future__ import annotations
-
 import argparse
-import json
+import functools
+import re
+import string
 import sys
 from pathlib import Path
-from typing import Iterable, Optional
-from urllib.parse import parse_qs, urlparse
-
-from youtube_transcript_api import (
-    NoTranscriptFound,
-    TranscriptsDisabled,
-    VideoUnavailable,
-    YouTubeTranscriptApi,
-)
+from typing import Iterable, Iterator, Optional
+
+# json, urllib.parse, and youtube_transcript_api (which drags in requests
+# and urllib3) are imported lazily where needed so that --help and
+# bad-input exits stay fast.
 
 _VIDEO_ID_LENGTH = 11
+_VIDEO_ID_CHARS = frozenset(string.ascii_letters + string.digits + "-_")
+_NEWLINE_TABLE = str.maketrans({"\n": " ", "\r": " "})
+_DEFAULT_LANGUAGES = ("en",)
+
+_URL_RE = re.compile(
+    r"^https?://"
+    r"(?:(?:www\.|m\.)?youtube\.com/(?:watch\?(?:[^#]*&)?v=|embed/|shorts/|live/)"
+    r"|youtu\.be/)"
+    r"([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+)
+
+
+def _parse_watch_query(query: str) -> str:
+    if query.startswith("v="):
+        index = 2
+    else:
+        index = query.find("&v=")
+        if index < 0:
+            return ""
+        index += 3
+    end = index + _VIDEO_ID_LENGTH
+    if end < len(query) and query[end] not in "&#":
+        return ""
+    return query[index:end]
 
 
 def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
@@ -63,18 +83,23 @@ def extract_video_id(value: str) -> str:
     if _looks_like_video_id(candidate):
         return candidate
 
-    parsed = urlparse(candidate)
-    if not parsed.scheme:
+    match = _URL_RE.match(candidate)
+    if match:
+        return match.group(1)
+
+    if "://" not in candidate:
         raise ValueError(f"Cannot parse YouTube video id from: {value}")
 
+    from urllib.parse import urlparse
+
+    parsed = urlparse(candidate)
     if parsed.hostname in {"youtu.be"}:
         video_id = parsed.path.lstrip("/")
         if _looks_like_video_id(video_id):
             return video_id
 
     if parsed.hostname and parsed.hostname.endswith("youtube.com"):
-        query = parse_qs(parsed.query)
-        video_id = query.get("v", [""])[0]
+        video_id = _parse_watch_query(parsed.query)
         if _looks_like_video_id(video_id):
             return video_id
 
@@ -82,14 +107,30 @@ def extract_video_id(value: str) -> str:
 
 
 def _looks_like_video_id(value: str) -> bool:
-    return len(value) == _VIDEO_ID_LENGTH and all(
-        ch.isalnum() or ch in {"-", "_"} for ch in value
-    )
+    return len(value) == _VIDEO_ID_LENGTH and _VIDEO_ID_CHARS.issuperset(value)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_api() -> "YouTubeTranscriptApi":
+    """Return a shared API client so repeat fetches reuse one HTTP session."""
+    from youtube_transcript_api import YouTubeTranscriptApi
 
+    return YouTubeTranscriptApi()
 
-def fetch_transcript(video_id: str, languages: Optional[Iterable[str]] = None) -> list[dict]:
-    api = YouTubeTranscriptApi()
-    requested_languages = tuple(languages) if languages else ("en",)
+
+def fetch_transcript(
+    video_id: str,
+    languages: Optional[Iterable[str]] = None,
+    api: Optional["YouTubeTranscriptApi"] = None,
+) -> "FetchedTranscript":
+    from youtube_transcript_api import (
+        NoTranscriptFound,
+        TranscriptsDisabled,
+        VideoUnavailable,
+    )
+
+    api = api or _get_api()
+    requested_languages = languages or _DEFAULT_LANGUAGES
     try:
         fetched = api.fetch(video_id, languages=requested_languages)
     except TranscriptsDisabled as exc:  # pragma: no cover - depends on external API
@@ -99,29 +140,77 @@ def fetch_transcript(video_id: str, languages: Optional[Iterable[str]] = None) -
     except VideoUnavailable as exc:  # pragma: no cover - depends on external API
         raise RuntimeError("The requested video is unavailable.") from exc
 
-    return fetched.to_raw_data()
+    return fetched
+
 
+def transcript_to_text(transcript: "FetchedTranscript", include_timestamps: bool) -> Iterator[str]:
+    """Yield one formatted line of plain text per non-empty transcript snippet."""
+    if include_timestamps:
+        for snippet in transcript:
+            text = _flatten_text(snippet.text)
+            if text:
+                yield "%.3f\t%s" % (snippet.start, text)
+    else:
+        for snippet in transcript:
+            text = _flatten_text(snippet.text)
+            if text:
+                yield text
+
+
+def _flatten_text(text: str) -> str:
+    if "\n" in text or "\r" in text:
+        text = text.translate(_NEWLINE_TABLE)
+    return text.strip()
+
+
+def _open_output(destination: Path, mode: str, **kwargs):
+    """Open destination for writing, creating parent directories on demand.
+
+    The happy path (parent already exists) costs no extra syscalls; the
+    mkdir only runs after the open fails with FileNotFoundError.
+    """
+    try:
+        return destination.open(mode, buffering=1 << 16, **kwargs)
+    except FileNotFoundError:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        return destination.open(mode, buffering=1 << 16, **kwargs)
+
+
+def write_output(lines: Iterable[str], destination: Optional[Path]) -> None:
+    if destination is None:
+        sys.stdout.writelines(line + "\n" for line in lines)
+        return
+
+    with _open_output(destination, "wb") as handle:
+        handle.writelines((line + "\n").encode("utf-8") for line in lines)
 
-def transcript_to_text(transcript: list[dict], include_timestamps: bool) -> str:
-    lines: list[str] = []
-    for entry in transcript:
-        text = entry.get("text", "").strip()
-        if not text:
-            continue
-        if include_timestamps:
-            start = entry.get("start", 0.0)
-            lines.append(f"{start:.3f}\t{text}")
+
+def write_json(transcript: list[dict], destination: Optional[Path]) -> None:
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover - optional accelerator
+        orjson = None
+
+    if orjson is not None:
+        data = orjson.dumps(transcript, option=orjson.OPT_INDENT_2)
+        if destination is None:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.write(b"\n")
         else:
-            lines.append(text)
-    return "\n".join(lines)
+            with _open_output(destination, "wb") as handle:
+                handle.write(data)
+        return
 
+    import json
 
-def write_output(content: str, destination: Optional[Path]) -> None:
     if destination is None:
-        print(content)
+        json.dump(transcript, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
         return
 
-    destination.write_text(content, encoding="utf-8")
+    with _open_output(destination, "w", encoding="utf-8") as handle:
+        json.dump(transcript, handle, indent=2, ensure_ascii=False)
 
 
 def main(argv: Optional[Iterable[str]] = None) -> int:
@@ -138,13 +227,12 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
         print(str(exc), file=sys.stderr)
         return 1
 
-    if args.json:
-        payload = json.dumps(transcript, indent=2, ensure_ascii=False)
-    else:
-        payload = transcript_to_text(transcript, include_timestamps=args.timestamps)
-
     try:
-        write_output(payload, args.output)
+        if args.json:
+            write_json(transcript.to_raw_data(), args.output)
+        else:
+            lines = transcript_to_text(transcript, include_timestamps=args.timestamps)
+            write_output(lines, args.output)
     except OSError as exc:
         print(f"Failed to write transcript: {exc}", file=sys.stderr)
         return 3